@@ -0,0 +1,361 @@
+"""
+REST API 压测
+按指定规模（用户、项目、每个项目的任务、评论讨论串及嵌套深度）生成 SQLite 数据库，
+用多个并发客户端驱动真实的 Flask 应用（进程内 test client，或本地 WSGI 服务器 + HTTP），
+跑一组场景：看板加载、拖拽更新、评论浏览、登录高峰、混合负载。
+报告每个场景的吞吐、p50/p95/p99 延迟、错误数和每请求 SQL 语句数（取自 Server-Timing 响应头），
+结果保存为 JSON，可用 --compare 与之前（其他提交）的结果对比
+用法：python bench_api.py [--mode client|server] [--scenarios board,drag,comments,login,mixed]
+                          [--concurrency 8] [--seconds 10] [--users 200] [--projects 50] [--tasks 200]
+                          [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from generate_data import DEFAULT_PASSWORD, EMAIL_TEMPLATE, generate
+
+STATUSES = ['todo', 'in_progress', 'review', 'done']
+QUERIES_PATTERN = re.compile(r'desc="(\d+) queries"')
+
+
+# ---------- 数据准备 ----------
+
+def seed(args):
+    """用 generate_data 按参数规模生成压测数据（均匀分布）"""
+    generate(args.users, args.projects, members=args.members, tasks=args.tasks, threads=args.threads,
+             replies=args.replies, depth=args.depth, password=DEFAULT_PASSWORD, seed=args.seed)
+
+
+def load_access():
+    """从成员表读出 {user_id: [可访问的项目 id]}"""
+    from app import app, db, project_members
+    with app.app_context():
+        rows = db.session.execute(db.select(project_members.c.user_id, project_members.c.project_id)).all()
+        db.session.remove()
+    access = {}
+    for user_id, project_id in rows:
+        access.setdefault(user_id, []).append(project_id)
+    return access
+
+
+def load_task_ids(project_ids):
+    from app import app, db, Task
+    with app.app_context():
+        rows = db.session.execute(db.select(Task.project_id, Task.id).where(Task.project_id.in_(project_ids))).all()
+        db.session.remove()
+    tasks = {}
+    for project_id, task_id in rows:
+        tasks.setdefault(project_id, []).append(task_id)
+    return tasks
+
+
+# ---------- 客户端 ----------
+
+class TestClientAdapter:
+    """进程内 Flask test client（不经过网络，测的是应用本身）"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.headers.get('Server-Timing'), response.get_data()
+
+
+class HttpAdapter:
+    """通过 HTTP/1.1 长连接访问本地 WSGI 服务器，自行保存会话 cookie"""
+
+    def __init__(self, host, port):
+        self.connection = http.client.HTTPConnection(host, port, timeout=60)
+        self.cookie = None
+
+    def request(self, method, path, body=None):
+        headers = {'Content-Type': 'application/json'}
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        payload = json.dumps(body) if body is not None else None
+        try:
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()  # 服务器关闭了连接，重连后重试一次
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+        data = response.read()
+        set_cookie = response.getheader('Set-Cookie')
+        if set_cookie:
+            self.cookie = set_cookie.split(';', 1)[0]
+        return response.status, response.getheader('Server-Timing'), data
+
+
+def start_server(app):
+    """在后台线程启动多线程 WSGI 服务器，返回 (server, port)"""
+    from werkzeug.serving import make_server, WSGIRequestHandler
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_request(self, *args, **kwargs):
+            pass  # 压测时不输出访问日志
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, name='bench-server', daemon=True).start()
+    return server, server.server_port
+
+
+# ---------- 场景 ----------
+
+class Worker:
+    def __init__(self, adapter, user_id, project_ids, task_ids, rng):
+        self.adapter = adapter
+        self.user_id = user_id
+        self.project_ids = project_ids
+        self.task_ids = task_ids
+        self.rng = rng
+        self.comment_cursor = None
+        self.samples = {}  # 操作名 -> [(毫秒, 状态码, 语句数)]
+
+    def call(self, name, method, path, body=None):
+        start = time.perf_counter()
+        status, server_timing, data = self.adapter.request(method, path, body)
+        elapsed = (time.perf_counter() - start) * 1000
+        match = QUERIES_PATTERN.search(server_timing or '')
+        self.samples.setdefault(name, []).append((elapsed, status, int(match.group(1)) if match else None))
+        return status, data
+
+    def login(self):
+        return self.call('login', 'POST', '/api/auth/login',
+                         {'email': EMAIL_TEMPLATE.format(self.user_id), 'password': DEFAULT_PASSWORD})
+
+    def pick_project(self):
+        return self.rng.choice(self.project_ids)
+
+
+def op_board(worker):
+    """打开看板：项目列表 + 当前项目的任务、成员和统计"""
+    project_id = worker.pick_project()
+    worker.call('projects', 'GET', '/api/projects')
+    worker.call('tasks', 'GET', f'/api/projects/{project_id}/tasks')
+    worker.call('members', 'GET', f'/api/projects/{project_id}/members')
+    worker.call('stats', 'GET', f'/api/projects/{project_id}/stats')
+
+
+def op_drag(worker):
+    """拖拽任务到另一列（单个更新），偶尔多选拖拽（批量更新）"""
+    project_id = worker.pick_project()
+    task_ids = worker.task_ids.get(project_id)
+    if not task_ids:
+        return
+    if worker.rng.random() < 0.8:
+        worker.call('move_task', 'PUT', f'/api/projects/{project_id}/tasks/update/{worker.rng.choice(task_ids)}',
+                    {'status': worker.rng.choice(STATUSES), 'position': worker.rng.randint(0, 1000)})
+    else:
+        status = worker.rng.choice(STATUSES)
+        chosen = worker.rng.sample(task_ids, min(10, len(task_ids)))
+        worker.call('bulk_move', 'PATCH', f'/api/projects/{project_id}/tasks/bulk',
+                    {'updates': [{'id': task_id, 'status': status, 'position': i} for i, task_id in enumerate(chosen)]})
+
+
+def op_comments(worker):
+    """按页浏览评论，翻到底后从第一页重新开始"""
+    path = '/api/comments?limit=20'
+    if worker.comment_cursor:
+        path += f'&cursor={worker.comment_cursor}'
+    status, data = worker.call('comments_page', 'GET', path)
+    worker.comment_cursor = json.loads(data).get('next_cursor') if status == 200 else None
+
+
+def op_login(worker):
+    worker.login()
+
+
+# 场景 -> [(权重, 操作)]
+SCENARIOS = {
+    'board': [(1, op_board)],
+    'drag': [(1, op_drag)],
+    'comments': [(1, op_comments)],
+    'login': [(1, op_login)],
+    'mixed': [(4, op_board), (3, op_drag), (2, op_comments), (1, op_login)],
+}
+
+
+def run_scenario(name, make_adapter, access, task_ids, args):
+    """用 concurrency 个线程跑 seconds 秒，返回汇总结果"""
+    operations = SCENARIOS[name]
+    weights = [weight for weight, _ in operations]
+    users = sorted(access)
+    workers = []
+    for i in range(args.concurrency):
+        user_id = users[i % len(users)]
+        worker = Worker(make_adapter(), user_id, access[user_id], task_ids, random.Random(args.seed + i))
+        status, _ = worker.login()
+        if status != 200:
+            raise RuntimeError(f'用户 {user_id} 登录失败: {status}')
+        worker.samples.clear()  # 准备阶段的登录不计入结果
+        workers.append(worker)
+
+    deadline = time.perf_counter() + args.seconds
+
+    def loop(worker):
+        while time.perf_counter() < deadline:
+            worker.rng.choices(operations, weights)[0][1](worker)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=loop, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    merged = {}
+    for worker in workers:
+        for operation, samples in worker.samples.items():
+            merged.setdefault(operation, []).extend(samples)
+    everything = [sample for samples in merged.values() for sample in samples]
+    return {
+        'seconds': round(elapsed, 3),
+        'total': summarize(everything, elapsed),
+        'operations': {operation: summarize(samples, elapsed) for operation, samples in sorted(merged.items())},
+    }
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(ms for ms, _, _ in samples)
+    queries = [count for _, _, count in samples if count is not None]
+    return {
+        'requests': len(samples),
+        'throughput': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'errors': sum(1 for _, status, _ in samples if status >= 400),
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+# ---------- 输出 ----------
+
+def print_result(name, result):
+    print(f"\n[{name}] {result['seconds']}s")
+    print(f"{'操作':<16}{'请求数':>8}{'请求/秒':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'错误':>6}{'语句/请求':>10}")
+    rows = list(result['operations'].items()) + [('合计', result['total'])]
+    for operation, stats in rows:
+        queries = stats['queries_per_request']
+        print(f"{operation:<16}{stats['requests']:>10}{stats['throughput']:>12.1f}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['errors']:>8}"
+              f"{'-' if queries is None else queries:>12}")
+
+
+def print_comparison(baseline, current):
+    print(f"\n与基线对比（基线提交 {baseline.get('commit') or '未知'}）")
+    print(f"{'场景':<12}{'请求/秒':>22}{'p95 ms':>22}{'语句/请求':>16}")
+    for name, result in current['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if not old:
+            continue
+        before, after = old['total'], result['total']
+        change = (after['throughput'] / before['throughput'] - 1) * 100 if before['throughput'] else 0.0
+        print(f"{name:<12}{before['throughput']:>10.1f} → {after['throughput']:<8.1f}({change:+.0f}%)"
+              f"{before['p95_ms']:>10.1f} → {after['p95_ms']:<8.1f}"
+              f"{before['queries_per_request'] or '-':>8} → {after['queries_per_request'] or '-'}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='REST API 压测')
+    parser.add_argument('--mode', choices=['client', 'server'], default='client',
+                        help='client：进程内 test client；server：本地 WSGI 服务器 + HTTP')
+    parser.add_argument('--scenarios', default='board,drag,comments,login,mixed', help='场景，逗号分隔')
+    parser.add_argument('--concurrency', type=int, default=8, help='并发客户端数')
+    parser.add_argument('--seconds', type=float, default=10, help='每个场景的时长')
+    parser.add_argument('--users', type=int, default=200, help='用户数')
+    parser.add_argument('--projects', type=int, default=50, help='项目数')
+    parser.add_argument('--members', type=int, default=8, help='每个项目的平均成员数（不含所有者）')
+    parser.add_argument('--tasks', type=int, default=200, help='每个项目的平均任务数')
+    parser.add_argument('--threads', type=int, default=100, help='评论讨论串数')
+    parser.add_argument('--replies', type=int, default=20, help='每个讨论串的平均回复数')
+    parser.add_argument('--depth', type=int, default=4, help='评论最大嵌套深度')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    parser.add_argument('--db', help='数据库文件路径（默认临时文件）')
+    parser.add_argument('--reuse', action='store_true', help='数据库文件已存在时直接使用，不重新生成')
+    parser.add_argument('--output', help='把结果保存为 JSON 文件')
+    parser.add_argument('--compare', help='与之前保存的 JSON 结果对比')
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(',')) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'未知场景: {", ".join(sorted(unknown))}')
+
+    db_path = os.path.abspath(args.db or os.path.join(tempfile.mkdtemp(prefix='bench_api_'), 'bench.db'))
+    reuse = args.reuse and os.path.exists(db_path)
+    # 必须在导入 app 之前设置
+    os.environ['DATABASE_URI'] = f'sqlite:///{db_path}'
+    os.environ.setdefault('REQUEST_QUERY_WARN', '0')  # 压测时不输出 N+1 告警
+    os.environ.setdefault('SLOW_QUERY_MS', '1000')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import app
+
+    start = time.perf_counter()
+    if not reuse:
+        seed(args)
+    access = load_access()
+    print(f"数据库 {db_path}（{'复用' if reuse else f'生成耗时 {time.perf_counter() - start:.1f}s'}）")
+    task_ids = load_task_ids(sorted({project_id for projects in access.values() for project_id in projects}))
+
+    server = None
+    if args.mode == 'server':
+        server, port = start_server(app)
+        make_adapter = lambda: HttpAdapter('127.0.0.1', port)
+    else:
+        make_adapter = lambda: TestClientAdapter(app)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.utcnow().isoformat(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'scenarios': {},
+    }
+    try:
+        for name in args.scenarios.split(','):
+            result = run_scenario(name, make_adapter, access, task_ids, args)
+            report['scenarios'][name] = result
+            print_result(name, result)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f'\n结果已保存到 {args.output}')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+评论树加载基准测试
+对比逐条懒加载（Comment.to_dict 递归）与 load_comment_threads 的查询次数和耗时
+用法：python bench_comments.py [--threads 20] [--sizes 10,50,200] [--depth 4]
+"""
+import argparse
+import random
+import time
+
+from bench_common import QueryCounter, reset_database, seed_users, use_temp_database
+
+use_temp_database('bench_comments')  # 必须在导入 app 之前
+
+from app import app, db, Comment, load_comment_threads
+
+
+def seed(threads, size, depth, users=50):
+    """生成 threads 个讨论串，每个讨论串 size 条评论，最大嵌套深度 depth"""
+    reset_database()
+    authors = seed_users(users)
+
+    for _ in range(threads):
+        root = Comment(content='顶级评论', user_id=random.choice(authors).id)
+        db.session.add(root)
+        db.session.flush()
+        levels = [[root]]
+        for _ in range(size - 1):
+            level = random.randrange(min(len(levels), depth))
+            parent = random.choice(levels[level])
+            reply = Comment(content='回复', user_id=random.choice(authors).id, parent_id=parent.id)
+            db.session.add(reply)
+            db.session.flush()
+            if level + 1 == len(levels):
+                levels.append([])
+            levels[level + 1].append(reply)
+    db.session.commit()
+
+
+def measure(loader):
+    db.session.expunge_all()  # 清空身份映射，保证每次都从数据库读取
+    with QueryCounter(db.engine) as counter:
+        start = time.perf_counter()
+        roots = Comment.query.filter_by(parent_id=None).order_by(Comment.created_at.desc()).all()
+        result = loader(roots)
+        elapsed = time.perf_counter() - start
+    return counter.count, elapsed * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='评论树加载基准测试')
+    parser.add_argument('--threads', type=int, default=20, help='讨论串数量')
+    parser.add_argument('--sizes', default='10,50,200', help='每个讨论串的评论数，逗号分隔')
+    parser.add_argument('--depth', type=int, default=4, help='最大嵌套深度')
+    args = parser.parse_args()
+
+    print(f"{'评论总数':>8} {'懒加载查询':>10} {'懒加载ms':>10} {'树加载查询':>10} {'树加载ms':>10}")
+    with app.app_context():
+        for size in (int(s) for s in args.sizes.split(',')):
+            seed(args.threads, size, args.depth)
+            lazy_queries, lazy_ms, lazy_result = measure(lambda roots: [c.to_dict() for c in roots])
+            tree_queries, tree_ms, tree_result = measure(load_comment_threads)
+            assert lazy_result == tree_result, '两种加载方式结果不一致'
+            print(f'{args.threads * size:>12} {lazy_queries:>15} {lazy_ms:>12.1f} {tree_queries:>15} {tree_ms:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
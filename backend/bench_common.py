@@ -0,0 +1,59 @@
+"""
+基准测试公共工具
+各 bench_*.py 在导入 app 之前调用 use_temp_database()：数据库总是指向新建的临时文件，
+忽略环境变量中的 DATABASE_URI（基准测试会清空并重建数据库，不能落到真实数据库上）
+"""
+import os
+import tempfile
+
+from sqlalchemy import event
+
+BENCH_EMAIL = 'user{}@bench.local'
+
+_temp_database = None
+
+
+def use_temp_database(name):
+    """把 DATABASE_URI 指向新的临时 SQLite 文件并返回文件路径，必须在导入 app 之前调用"""
+    global _temp_database
+    _temp_database = os.path.join(tempfile.mkdtemp(prefix=f'{name}_'), 'bench.db')
+    os.environ['DATABASE_URI'] = f'sqlite:///{_temp_database}'
+    return _temp_database
+
+
+def reset_database():
+    """清空并重建临时数据库；当前引擎不是 use_temp_database 创建的文件时拒绝执行"""
+    from app import db
+    if _temp_database is None or db.engine.url.database != _temp_database:
+        raise RuntimeError(f'拒绝清空非临时数据库: {db.engine.url!r}')
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def seed_users(count, password_hash=None):
+    """创建 count 个用户（邮箱见 BENCH_EMAIL，编号从 0 开始）并 flush，返回用户列表"""
+    from app import db, User
+    users = [User(name=f'用户{i}', email=BENCH_EMAIL.format(i), password_hash=password_hash) for i in range(count)]
+    db.session.add_all(users)
+    db.session.flush()
+    return users
+
+
+class QueryCounter:
+    """统计引擎上执行的 SQL 语句数"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
@@ -0,0 +1,113 @@
+"""
+JSON 序列化基准测试
+在 10k 任务的项目上对比：旧的逐字段 to_dict（逐个 isoformat）与预编译序列化函数，
+标准库 json 与 orjson 的序列化耗时，以及 GET /api/projects/<id>/tasks 的每秒请求数
+用法：python bench_json.py [--tasks 10000] [--requests 20]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from bench_common import reset_database, seed_users, use_temp_database
+
+use_temp_database('bench_json')  # 必须在导入 app 之前
+
+import app as app_module
+from app import app, db, Project, Task, bump_project_counters, task_counter_deltas
+
+
+def legacy_task_dict(task):
+    """改造前的 Task.to_dict：逐个字段取值、逐个调用 isoformat()"""
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'project_id': task.project_id,
+        'assignee_id': task.assignee_id,
+        'assignee_name': task.assignee.name if task.assignee else None,
+        'assignee_avatar': task.assignee.name[0] if task.assignee else None,
+        'priority': task.priority,
+        'status': task.status,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'position': task.position,
+        'created_at': task.created_at.isoformat() if task.created_at else None,
+        'updated_at': task.updated_at.isoformat() if task.updated_at else None
+    }
+
+
+def seed(tasks, users=50):
+    reset_database()
+    members = seed_users(users)
+    project = Project(name='压测项目', owner=members[0])
+    project.members.extend(members)
+    db.session.add(project)
+    db.session.flush()
+    now = datetime.utcnow()
+    rows = []
+    for i in range(tasks):
+        status = random.choice(['todo', 'in_progress', 'review', 'done'])
+        priority = random.choice(['low', 'medium', 'high', 'urgent'])
+        rows.append({'title': f'任务{i}', 'description': '任务描述' * 5, 'project_id': project.id,
+                     'assignee_id': random.choice(members).id, 'priority': priority, 'status': status,
+                     'due_date': now + timedelta(days=random.randrange(-30, 60)), 'position': i,
+                     'created_at': now, 'updated_at': now})
+        bump_project_counters(project.id, task_counter_deltas(status, priority))
+    db.session.execute(Task.__table__.insert(), rows)
+    db.session.commit()
+    return project.id, members[0].id
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON 序列化基准测试')
+    parser.add_argument('--tasks', type=int, default=10000, help='任务数量')
+    parser.add_argument('--requests', type=int, default=20, help='每个 provider 的请求次数')
+    args = parser.parse_args()
+
+    providers = ['stdlib'] + (['orjson'] if app_module.orjson is not None else [])
+    with app.app_context():
+        project_id, user_id = seed(args.tasks)
+        tasks = Task.query.filter_by(project_id=project_id).all()
+        for task in tasks:
+            task.assignee  # 预先加载负责人，只比较序列化本身
+
+        print(f'{args.tasks} 个任务')
+        print(f"{'构建字典':<20}{'ms':>10}")
+        legacy_ms = best_of(lambda: [legacy_task_dict(task) for task in tasks])
+        compiled_ms = best_of(lambda: [task.to_dict() for task in tasks])
+        print(f"{'逐字段 to_dict':<20}{legacy_ms:>12.1f}")
+        print(f"{'预编译序列化':<20}{compiled_ms:>12.1f}")
+
+        legacy = [legacy_task_dict(task) for task in tasks]
+        compiled = [task.to_dict() for task in tasks]
+        print(f"\n{'provider':<12}{'dumps ms':>10}{'请求/秒':>10}{'ms/请求':>10}")
+        for name in providers:
+            app.json = app_module.select_json_provider(name)
+            assert json.loads(app.json.dumps(compiled)) == legacy, '序列化结果与旧格式不一致'
+            dumps_ms = best_of(lambda: app.json.dumps(compiled))
+
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['user_id'] = user_id
+            client.get(f'/api/projects/{project_id}/tasks')  # 预热
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                response = client.get(f'/api/projects/{project_id}/tasks')
+                assert response.status_code == 200
+            elapsed = time.perf_counter() - start
+            print(f'{name:<12}{dumps_ms:>10.1f}{args.requests / elapsed:>12.1f}{elapsed / args.requests * 1000:>10.1f}')
+        app.json = app_module.select_json_provider()
+
+
+if __name__ == '__main__':
+    main()
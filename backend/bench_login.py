@@ -0,0 +1,94 @@
+"""
+登录吞吐基准测试
+在不同密码哈希参数、不同校验方式（请求线程内 / 线程池 / 进程池）下测量登录吞吐和延迟
+用法：python bench_login.py [--methods pbkdf2:sha256:600000,scrypt] [--logins 200] [--threads 8]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_common import BENCH_EMAIL, reset_database, seed_users, use_temp_database
+
+use_temp_database('bench_login')  # 必须在导入 app 之前
+
+import app as app_module
+from app import app, db
+
+PASSWORD = 'bench-password'
+
+
+def seed(users):
+    reset_database()
+    password_hash = app_module.hash_password(PASSWORD)  # 所有用户共用一个哈希，加快准备
+    seed_users(users, password_hash)
+    db.session.commit()
+
+
+def reset_pool(kind, workers):
+    """切换校验方式，丢弃已创建的校验池"""
+    if app_module._verify_executor is not None:
+        app_module._verify_executor.shutdown()
+    app_module._verify_executor = None
+    app.config['PASSWORD_VERIFY_POOL'] = kind
+    app.config['PASSWORD_VERIFY_WORKERS'] = workers
+
+
+def run(logins, threads, users):
+    """用 threads 个并发客户端完成 logins 次登录，返回 (吞吐, 延迟列表ms, 失败数)"""
+    def one(i):
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.post('/api/auth/login',
+                               json={'email': BENCH_EMAIL.format(i % users), 'password': PASSWORD})
+        return (time.perf_counter() - start) * 1000, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(one, range(logins)))
+    elapsed = time.perf_counter() - start
+    latencies = [ms for ms, status in results if status == 200]
+    failures = sum(1 for _, status in results if status != 200)
+    return logins / elapsed, latencies, failures
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='登录吞吐基准测试')
+    parser.add_argument('--methods', default='pbkdf2:sha256:600000,scrypt', help='哈希方法，逗号分隔')
+    parser.add_argument('--logins', type=int, default=200, help='每个场景的登录次数')
+    parser.add_argument('--threads', type=int, default=8, help='并发客户端数')
+    parser.add_argument('--users', type=int, default=50, help='用户数')
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    scenarios = [
+        ('单线程/请求内校验', 1, None),
+        (f'{args.threads}并发/请求内校验', args.threads, None),
+        (f'{args.threads}并发/线程池', args.threads, 'thread'),
+        (f'{args.threads}并发/进程池', args.threads, 'process'),
+    ]
+
+    print(f'CPU 核数: {cores}')
+    print(f"{'哈希方法':<24}{'场景':<20}{'登录/秒':>10}{'登录/秒/核':>12}{'p50 ms':>10}{'p99 ms':>10}{'失败':>6}")
+    with app.app_context():
+        for method in args.methods.split(','):
+            app.config['PASSWORD_HASH_METHOD'] = method
+            seed(args.users)
+            for name, threads, pool in scenarios:
+                reset_pool(pool, cores)
+                throughput, latencies, failures = run(args.logins, threads, args.users)
+                busy_cores = min(threads, cores)
+                print(f'{method:<28}{name:<18}{throughput:>10.1f}{throughput / busy_cores:>12.1f}'
+                      f'{percentile(latencies, 50):>10.1f}{percentile(latencies, 99):>10.1f}{failures:>6}')
+        reset_pool(None, cores)
+
+
+if __name__ == '__main__':
+    main()
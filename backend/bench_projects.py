@@ -0,0 +1,85 @@
+"""
+项目列表查询次数基准测试
+对比改造前的写法（两个关系懒加载 + 每个项目懒加载所有者和整个成员列表）与现在的 /api/projects
+用法：python bench_projects.py [--projects 500] [--members 8]
+"""
+import argparse
+import random
+import time
+
+from bench_common import QueryCounter, reset_database, seed_users, use_temp_database
+
+use_temp_database('bench_projects')  # 必须在导入 app 之前
+
+from app import app, db, User, Project, project_members, rebuild_project_counters
+
+
+def seed(projects, members, owners=50):
+    """目标用户参与 projects 个项目（所有者各不相同），每个项目 members 个成员"""
+    reset_database()
+    users = seed_users(owners + members)
+    target = users[0]
+    rows = []
+    for i in range(projects):
+        owner = users[1 + i % owners]
+        project = Project(name=f'项目{i}', owner_id=owner.id)
+        db.session.add(project)
+        db.session.flush()
+        others = random.sample(users[1:], members - 1)
+        rows.extend({'project_id': project.id, 'user_id': user.id} for user in {target, owner, *others})
+    db.session.execute(project_members.insert(), rows)
+    db.session.commit()
+    rebuild_project_counters()
+    return target.id
+
+
+def legacy_listing(user_id):
+    """改造前 get_projects 的实现"""
+    user = db.session.get(User, user_id)
+    projects = user.owned_projects + user.projects
+    unique_projects = list({p.id: p for p in projects}.values())
+    return [{
+        'id': project.id,
+        'owner_name': project.owner.name if project.owner else None,
+        'member_count': len(project.members) if project.members else 0,
+    } for project in unique_projects]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='项目列表查询次数基准测试')
+    parser.add_argument('--projects', type=int, default=500, help='用户参与的项目数')
+    parser.add_argument('--members', type=int, default=8, help='每个项目的成员数')
+    args = parser.parse_args()
+
+    with app.app_context():
+        user_id = seed(args.projects, args.members)
+
+        db.session.expunge_all()
+        with QueryCounter(db.engine) as counter:
+            start = time.perf_counter()
+            legacy = legacy_listing(user_id)
+            legacy_ms = (time.perf_counter() - start) * 1000
+        legacy_queries = counter.count
+        db.session.remove()
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+    with app.app_context():
+        with QueryCounter(db.engine) as counter:
+            start = time.perf_counter()
+            current = client.get('/api/projects').get_json()
+            current_ms = (time.perf_counter() - start) * 1000
+
+    assert len(current) == len(legacy) == args.projects
+    legacy_counts = {p['id']: p['member_count'] for p in legacy}
+    assert all(p['member_count'] == legacy_counts[p['id']] for p in current), '成员数不一致'
+
+    print(f'用户参与 {args.projects} 个项目，每个项目 {args.members} 个成员')
+    print(f"{'实现':<10}{'查询次数':>10}{'耗时ms':>10}")
+    print(f"{'改造前':<10}{legacy_queries:>12}{legacy_ms:>12.1f}")
+    print(f"{'现在':<11}{counter.count:>12}{current_ms:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
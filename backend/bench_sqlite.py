@@ -0,0 +1,113 @@
+"""
+SQLite 并发基准测试
+用 N 个读进程 + M 个写进程（模拟多个 gunicorn worker）同时访问真实接口，
+对比默认配置（回滚日志、synchronous=FULL）与 WAL 调优配置的吞吐和锁冲突
+用法：python bench_sqlite.py [--readers 4] [--writers 2] [--seconds 5]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = [
+    ('默认配置', {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+              'SQLITE_CACHE_SIZE': '-2000', 'SQLITE_MMAP_SIZE': '0'}),
+    ('WAL调优', {}),  # 使用 app.py 中的默认值
+]
+
+
+def worker(kind, project_id, task_ids, seconds, queue):
+    """单个 worker 进程：循环调用读接口或写接口，统计成功数和失败数"""
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)  # 不复用父进程的连接
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    ok = errors = locked = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if kind == 'read':
+            response = client.get(f'/api/projects/{project_id}/tasks?limit=50')
+        else:
+            response = client.put(f'/api/projects/{project_id}/tasks/update/{random.choice(task_ids)}',
+                                  json={'status': random.choice(['todo', 'in_progress', 'review', 'done'])})
+        if response.status_code == 200:
+            ok += 1
+        else:
+            errors += 1
+            locked += 'locked' in response.get_data(as_text=True)
+    queue.put((kind, ok, errors, locked))
+
+
+def run_profile(readers, writers, seconds, tasks):
+    """在当前进程的配置下建库并压测（由主进程通过子进程调用，保证配置在导入 app 前生效）"""
+    from app import app, db, User, Project, Task
+    with app.app_context():
+        db.create_all()
+        user = User(name='压测用户', email='bench@bench.local')
+        project = Project(name='压测项目', owner=user)
+        project.members.append(user)
+        db.session.add(project)
+        db.session.flush()
+        db.session.add_all([Task(title=f'任务{i}', project_id=project.id, assignee_id=user.id) for i in range(tasks)])
+        db.session.commit()
+        project_id = project.id
+        task_ids = [task.id for task in Task.query.all()]
+        db.session.remove()
+        db.engine.dispose()
+
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=worker, args=('read', project_id, task_ids, seconds, queue))
+                 for _ in range(readers)]
+    processes += [multiprocessing.Process(target=worker, args=('write', project_id, task_ids, seconds, queue))
+                  for _ in range(writers)]
+    for process in processes:
+        process.start()
+    results = [queue.get(timeout=seconds + 60) for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {'read_ok': 0, 'write_ok': 0, 'errors': 0, 'locked': 0}
+    for kind, ok, errors, locked in results:
+        summary[f'{kind}_ok'] += ok
+        summary['errors'] += errors
+        summary['locked'] += locked
+    print(json.dumps(summary))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 并发基准测试')
+    parser.add_argument('--readers', type=int, default=4, help='读进程数')
+    parser.add_argument('--writers', type=int, default=2, help='写进程数')
+    parser.add_argument('--seconds', type=float, default=5, help='每个配置的压测时长')
+    parser.add_argument('--tasks', type=int, default=200, help='任务数量')
+    parser.add_argument('--run-profile', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_profile:
+        run_profile(args.readers, args.writers, args.seconds, args.tasks)
+        return
+
+    print(f'{args.readers} 读进程 + {args.writers} 写进程，每个配置 {args.seconds} 秒')
+    print(f"{'配置':<10}{'读/秒':>10}{'写/秒':>10}{'失败':>8}{'锁冲突':>8}")
+    for name, overrides in PROFILES:
+        db_dir = tempfile.mkdtemp(prefix='bench_sqlite_')
+        env = dict(os.environ, DATABASE_URI=f'sqlite:///{os.path.join(db_dir, "bench.db")}', **overrides)
+        output = subprocess.run([sys.executable, __file__, '--run-profile',
+                                 '--readers', str(args.readers), '--writers', str(args.writers),
+                                 '--seconds', str(args.seconds), '--tasks', str(args.tasks)],
+                                env=env, capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        summary = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:<10}{summary['read_ok'] / args.seconds:>12.1f}{summary['write_ok'] / args.seconds:>12.1f}"
+              f"{summary['errors']:>10}{summary['locked']:>10}")
+
+
+if __name__ == '__main__':
+    main()
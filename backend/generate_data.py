@@ -0,0 +1,307 @@
+"""
+大规模测试数据生成
+按可配置的规模和分布生成用户、项目、成员关系、任务和嵌套评论树，用于在接近生产的数据量下测试和压测。
+写入方式：每张表在一个大事务里按批 executemany（元组参数，绕过 ORM 和逐行类型转换）；
+加载期间删除二级索引和 FTS 触发器、放宽 SQLite PRAGMA（synchronous=OFF、journal_mode=MEMORY、大缓存），
+写完后重建索引、全文搜索表和项目计数器，恢复 PRAGMA 并执行 ANALYZE。
+生成的任务没有变更日志记录（task_changes 为空），客户端首次全量加载后再增量同步
+注意：会清空目标数据库
+用法：python generate_data.py --db instance/fixture.db [--users 1000000] [--projects 100000] [--tasks 80]
+                              [--task-dist pareto] [--threads 200000] [--replies 5] [--depth 4] [--force]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import islice
+
+EMAIL_TEMPLATE = 'user{}@example.com'
+DEFAULT_PASSWORD = 'password123'
+DISTRIBUTIONS = ('uniform', 'exponential', 'pareto')
+PARETO_ALPHA = 1.5  # 长尾：少数项目/讨论串很大，多数很小
+STATUS_WEIGHTS = {'todo': 30, 'in_progress': 20, 'review': 10, 'done': 40}
+PRIORITY_WEIGHTS = {'low': 25, 'medium': 45, 'high': 20, 'urgent': 10}
+PROJECT_STATUS_WEIGHTS = {'active': 80, 'completed': 15, 'archived': 5}
+TIMESTAMP_POOL = 10000  # 预先格式化的时间戳个数，避免逐行格式化
+
+SURNAMES = '王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹'
+GIVEN_NAMES = '伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉萍红娥玲芬燕'
+PROJECT_NAMES = ['官网改版', '移动端', '数据平台', '支付系统', '运营活动', '客服系统', '内部工具', '搜索优化']
+TASK_VERBS = ['修复', '实现', '优化', '设计', '评审', '测试', '重构', '上线']
+TASK_OBJECTS = ['登录页', '看板拖拽', '评论分页', '导出报表', '权限校验', '消息通知', '搜索接口', '缓存策略']
+COMMENTS = ['同意', '这个方案可以', '需要再讨论一下', '已修复，请验证', '有截图吗？', '周五前完成', '+1', '辛苦了']
+PLACEHOLDERS = {'qmark': '?', 'format': '%s', 'pyformat': '%s'}
+
+
+def sample_count(rng, distribution, mean):
+    """按分布抽取一个非负整数，期望约等于 mean"""
+    if mean <= 0:
+        return 0
+    if distribution == 'uniform':
+        return int(rng.uniform(0, 2 * mean) + 0.5)
+    if distribution == 'exponential':
+        return int(rng.expovariate(1 / mean) + 0.5)
+    return int(mean * (PARETO_ALPHA - 1) / PARETO_ALPHA * rng.paretovariate(PARETO_ALPHA) + 0.5)
+
+
+def parse_weights(text):
+    """解析 'todo=3,done=1' 形式的权重"""
+    weights = {}
+    for item in text.split(','):
+        name, _, value = item.partition('=')
+        try:
+            weights[name.strip()] = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'无效的权重: {item}')
+    return weights
+
+
+def timestamp_pool(rng, start, days):
+    """start 起 days 天内的随机时间戳（已格式化为 SQLAlchemy 的 SQLite 存储格式），按时间排序"""
+    seconds = days * 86400
+    return sorted((start + timedelta(seconds=rng.randrange(seconds))).strftime('%Y-%m-%d %H:%M:%S.%f')
+                  for _ in range(TIMESTAMP_POOL))
+
+
+def bulk_insert(connection, table, columns, rows, batch_size):
+    """按批 executemany 插入，rows 为按 columns 顺序排列的元组迭代器，返回插入的行数"""
+    placeholder = PLACEHOLDERS[connection.dialect.paramstyle]
+    statement = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                 f"VALUES ({', '.join([placeholder] * len(columns))})")
+    total = 0
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return total
+        connection.exec_driver_sql(statement, batch)
+        total += len(batch)
+
+
+@contextmanager
+def bulk_load(connection):
+    """加载期间删除二级索引和搜索索引、放宽持久性设置，结束后全部恢复"""
+    from app import app, db, create_task_search_index, _task_fts_engines
+    dialect = connection.dialect.name
+    indexes = [index for table in db.metadata.sorted_tables for index in table.indexes]
+    for index in indexes:
+        index.drop(connection)
+    if dialect == 'sqlite':
+        connection.exec_driver_sql("DROP TABLE IF EXISTS tasks_fts")  # 触发器引用该表，一并删除
+        for trigger in ('ai', 'ad', 'au'):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS tasks_fts_{trigger}")
+    elif dialect == 'postgresql':
+        connection.exec_driver_sql("DROP INDEX IF EXISTS ix_tasks_title_trgm, ix_tasks_description_trgm")
+        connection.exec_driver_sql("SET synchronous_commit = off")
+    connection.commit()
+    if dialect == 'sqlite':
+        # journal_mode 不能在事务中修改
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        connection.exec_driver_sql("PRAGMA journal_mode = MEMORY")
+        connection.exec_driver_sql("PRAGMA cache_size = -1048576")  # 约1GB
+        connection.exec_driver_sql("PRAGMA temp_store = MEMORY")
+
+    yield
+
+    connection.commit()
+    start = time.perf_counter()
+    for index in indexes:
+        index.create(connection)
+    if create_task_search_index(connection) and dialect == 'sqlite':
+        connection.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+    _task_fts_engines.clear()
+    connection.commit()
+    print(f"重建索引和搜索表: {time.perf_counter() - start:.1f}s")
+    if dialect == 'sqlite':
+        connection.exec_driver_sql(f"PRAGMA journal_mode = {app.config['SQLITE_JOURNAL_MODE']}")
+        connection.exec_driver_sql(f"PRAGMA synchronous = {app.config['SQLITE_SYNCHRONOUS']}")
+        connection.exec_driver_sql(f"PRAGMA cache_size = {int(app.config['SQLITE_CACHE_SIZE'])}")
+    connection.exec_driver_sql("ANALYZE")
+    connection.commit()
+
+
+def reset_sequences(connection):
+    """PostgreSQL：显式写入 id 后把自增序列推进到当前最大值"""
+    if connection.dialect.name != 'postgresql':
+        return
+    for table in ('users', 'projects', 'tasks', 'comments'):
+        connection.exec_driver_sql(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                                   f"COALESCE((SELECT MAX(id) FROM {table}), 1))")
+
+
+def generate(users, projects, members=8, tasks=100, threads=1000, replies=10, depth=4,
+             member_dist='uniform', task_dist='uniform', reply_dist='uniform', unassigned=0.1,
+             status_weights=None, priority_weights=None, password=DEFAULT_PASSWORD, seed=42, batch_size=50000):
+    """
+    清空当前数据库（DATABASE_URI）并生成数据，返回 {表名: 行数}
+    members / tasks / replies 为每个项目的成员数（不含所有者）、每个项目的任务数、每个讨论串的回复数的期望值，
+    分布见 *_dist；所有用户的密码都是 password
+    """
+    from app import app, db, hash_password, rebuild_project_counters
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    created = timestamp_pool(rng, now - timedelta(days=365), 365)
+    due = timestamp_pool(rng, now - timedelta(days=30), 120)
+    statuses, status_cum = _cumulative(status_weights or STATUS_WEIGHTS)
+    priorities, priority_cum = _cumulative(priority_weights or PRIORITY_WEIGHTS)
+    project_statuses, project_status_cum = _cumulative(PROJECT_STATUS_WEIGHTS)
+    counts = {}
+    teams = []
+
+    def user_rows():
+        password_hash = hash_password(password)  # 所有用户共用一个哈希
+        for user_id in range(1, users + 1):
+            name = rng.choice(SURNAMES) + ''.join(rng.choices(GIVEN_NAMES, k=rng.randint(1, 2)))
+            timestamp = rng.choice(created)
+            yield user_id, name, EMAIL_TEMPLATE.format(user_id), password_hash, timestamp, timestamp
+
+    def project_rows():
+        for project_id in range(1, projects + 1):
+            owner_id = rng.randint(1, users)
+            team = {owner_id}
+            size = min(users, 1 + sample_count(rng, member_dist, members))
+            while len(team) < size:
+                team.add(rng.randint(1, users))
+            teams.append(tuple(team))
+            timestamp = rng.choice(created)
+            yield (project_id, f'{rng.choice(PROJECT_NAMES)} {project_id}', '自动生成的测试项目', owner_id,
+                   rng.choices(project_statuses, cum_weights=project_status_cum)[0], timestamp, timestamp)
+
+    def member_rows():
+        for project_id, team in enumerate(teams, 1):
+            for user_id in team:
+                yield project_id, user_id, rng.choice(created)
+
+    def task_rows():
+        task_id = 0
+        for project_id, team in enumerate(teams, 1):
+            count = sample_count(rng, task_dist, tasks)
+            positions = dict.fromkeys(statuses, 0)
+            for status, priority in zip(rng.choices(statuses, cum_weights=status_cum, k=count),
+                                        rng.choices(priorities, cum_weights=priority_cum, k=count)):
+                task_id += 1
+                assignee_id = None if rng.random() < unassigned else rng.choice(team)
+                timestamp = rng.choice(created)
+                yield (f'{rng.choice(TASK_VERBS)}{rng.choice(TASK_OBJECTS)} #{task_id}', '自动生成的测试任务',
+                       project_id, assignee_id, priority, status, rng.choice(due) if rng.random() < 0.8 else None,
+                       positions[status], timestamp, timestamp)
+                positions[status] += 1
+
+    def comment_rows():
+        comment_id = 0
+        for _ in range(threads):
+            comment_id += 1
+            timestamp = rng.choice(created)
+            yield comment_id, rng.choice(COMMENTS), rng.randint(1, users), None, int(rng.expovariate(0.5)), \
+                timestamp, timestamp
+            levels = [[comment_id]]  # 每层已有的评论，回复挂在随机一层（不超过 depth）的随机评论下
+            for _ in range(sample_count(rng, reply_dist, replies)):
+                level = rng.randrange(min(len(levels), depth))
+                comment_id += 1
+                yield comment_id, rng.choice(COMMENTS), rng.randint(1, users), rng.choice(levels[level]), \
+                    int(rng.expovariate(0.5)), timestamp, timestamp
+                if level + 1 == len(levels):
+                    levels.append([])
+                levels[level + 1].append(comment_id)
+
+    plan = [
+        ('users', ('id', 'name', 'email', 'password_hash', 'created_at', 'updated_at'), user_rows),
+        ('projects', ('id', 'name', 'description', 'owner_id', 'status', 'created_at', 'updated_at'), project_rows),
+        ('project_members', ('project_id', 'user_id', 'joined_at'), member_rows),
+        ('tasks', ('title', 'description', 'project_id', 'assignee_id', 'priority', 'status', 'due_date',
+                   'position', 'created_at', 'updated_at'), task_rows),
+        ('comments', ('id', 'content', 'user_id', 'parent_id', 'likes', 'created_at', 'updated_at'), comment_rows),
+    ]
+
+    with app.app_context():
+        slow_query_ms = app.config['SLOW_QUERY_MS']
+        app.config['SLOW_QUERY_MS'] = float('inf')  # 批量语句必然很慢，不记慢查询日志
+        try:
+            db.session.remove()
+            db.drop_all()
+            db.create_all()
+            with db.engine.connect() as connection:
+                with bulk_load(connection):
+                    for table, columns, rows in plan:
+                        start = time.perf_counter()
+                        counts[table] = bulk_insert(connection, table, columns, rows(), batch_size)
+                        connection.commit()
+                        elapsed = time.perf_counter() - start
+                        print(f"{table:<16}{counts[table]:>12} 行 {elapsed:>8.1f}s "
+                              f"{counts[table] / elapsed if elapsed else 0:>10.0f} 行/秒")
+                    reset_sequences(connection)
+            start = time.perf_counter()
+            rebuild_project_counters()
+            print(f"重建项目计数器: {time.perf_counter() - start:.1f}s")
+        finally:
+            app.config['SLOW_QUERY_MS'] = slow_query_ms
+            db.session.remove()
+    return counts
+
+
+def _cumulative(weights):
+    names = list(weights)
+    cumulative, total = [], 0
+    for name in names:
+        total += weights[name]
+        cumulative.append(total)
+    return names, cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description='大规模测试数据生成（会清空目标数据库）')
+    parser.add_argument('--db', help='SQLite 数据库文件路径（不指定时使用 DATABASE_URI 环境变量）')
+    parser.add_argument('--force', action='store_true', help='目标数据库已存在时仍然覆盖')
+    parser.add_argument('--users', type=int, default=100000, help='用户数')
+    parser.add_argument('--projects', type=int, default=10000, help='项目数')
+    parser.add_argument('--members', type=float, default=8, help='每个项目的平均成员数（不含所有者）')
+    parser.add_argument('--member-dist', choices=DISTRIBUTIONS, default='exponential', help='项目成员数分布')
+    parser.add_argument('--tasks', type=float, default=80, help='每个项目的平均任务数')
+    parser.add_argument('--task-dist', choices=DISTRIBUTIONS, default='pareto', help='项目任务数分布')
+    parser.add_argument('--unassigned', type=float, default=0.1, help='未分配负责人的任务比例')
+    parser.add_argument('--status-weights', type=parse_weights,
+                        help='任务状态权重，如 todo=30,in_progress=20,review=10,done=40')
+    parser.add_argument('--priority-weights', type=parse_weights,
+                        help='任务优先级权重，如 low=25,medium=45,high=20,urgent=10')
+    parser.add_argument('--threads', type=int, default=20000, help='评论讨论串（顶级评论）数')
+    parser.add_argument('--replies', type=float, default=5, help='每个讨论串的平均回复数')
+    parser.add_argument('--reply-dist', choices=DISTRIBUTIONS, default='pareto', help='讨论串回复数分布')
+    parser.add_argument('--depth', type=int, default=4, help='评论最大嵌套深度')
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help='所有用户的密码')
+    parser.add_argument('--batch-size', type=int, default=50000, help='每批 executemany 的行数')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    args = parser.parse_args()
+
+    if args.users < 1:
+        parser.error('--users 至少为 1')
+    if args.depth < 1:
+        parser.error('--depth 至少为 1')
+    for weights in (args.status_weights, args.priority_weights):
+        if weights is not None and (min(weights.values()) < 0 or not sum(weights.values())):
+            parser.error('权重不能为负，且总和必须大于 0')
+
+    # 必须在导入 app 之前设置
+    if args.db:
+        db_path = os.path.abspath(args.db)
+        if os.path.exists(db_path) and not args.force:
+            parser.error(f'{db_path} 已存在，使用 --force 覆盖')
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        os.environ['DATABASE_URI'] = f'sqlite:///{db_path}'
+    elif not args.force:
+        parser.error('未指定 --db 时会清空 DATABASE_URI 指向的数据库，确认请加 --force')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    start = time.perf_counter()
+    counts = generate(args.users, args.projects, members=args.members, tasks=args.tasks, threads=args.threads,
+                      replies=args.replies, depth=args.depth, member_dist=args.member_dist,
+                      task_dist=args.task_dist, reply_dist=args.reply_dist, unassigned=args.unassigned,
+                      status_weights=args.status_weights, priority_weights=args.priority_weights,
+                      password=args.password, seed=args.seed, batch_size=args.batch_size)
+    print(f"共 {sum(counts.values())} 行，总耗时 {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+批量导入用户命令行工具
+用法：python import_users.py users.csv [--chunk-size 1000] [--workers 4]
+支持 CSV（表头 name,email,password）和 JSON（对象数组）文件
+"""
+import argparse
+import json
+import sys
+
+from app import app, import_users, parse_user_csv, IMPORT_CHUNK_SIZE
+
+
+def load_rows(path):
+    with open(path, encoding='utf-8-sig') as f:
+        if path.lower().endswith('.json'):
+            data = json.load(f)
+            return data.get('users', []) if isinstance(data, dict) else data
+        return parse_user_csv(f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量导入用户')
+    parser.add_argument('path', help='CSV 或 JSON 文件路径')
+    parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help='每个事务插入的行数')
+    parser.add_argument('--workers', type=int, default=None, help='计算密码哈希的线程数（默认 CPU 核数）')
+    args = parser.parse_args()
+
+    rows = load_rows(args.path)
+    with app.app_context():
+        result = import_users(rows, chunk_size=args.chunk_size, workers=args.workers)
+
+    print(f"共 {len(rows)} 行，成功导入 {result['created']} 个用户，失败 {len(result['errors'])} 行")
+    for error in result['errors']:
+        print(f"  第 {error['row']} 行 {error['email'] or ''}: {error['error']}")
+    sys.exit(1 if result['errors'] else 0)
+
+
+if __name__ == '__main__':
+    main()
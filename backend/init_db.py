@@ -6,6 +6,12 @@ def init_database():
         db.create_all()
         print("数据库表创建成功！")
         
+        # 已有数据库补齐新增的列和索引
+        from app import migrate_schema
+        applied = migrate_schema()
+        if applied:
+            print(f"数据库迁移完成: {', '.join(applied)}")
+        
         from app import User
         if User.query.count() == 0:
             sample_users = [
@@ -0,0 +1,15 @@
+"""
+重建项目计数器
+从 project_members 和 tasks 表重新计算 project_counters（成员数、任务数、按状态/优先级的任务数）
+用法：python rebuild_counters.py
+"""
+from app import app, rebuild_project_counters
+
+
+def main():
+    with app.app_context():
+        print(f"已重建 {rebuild_project_counters()} 个项目的计数器")
+
+
+if __name__ == '__main__':
+    main()
@@ -181,14 +181,19 @@ function App() {
     }
   };
 
-  // 获取任务列表
+  // 获取任务列表（搜索和筛选交给后端在数据库中完成）
   const fetchTasks = async (projectId) => {
     if (!projectId) return;
     
+    const params = {};
+    if (taskSearchTerm.trim()) params.q = taskSearchTerm.trim();
+    if (taskFilterPriority !== 'all') params.priority = taskFilterPriority;
+    if (taskFilterAssignee !== 'all') params.assignee_id = taskFilterAssignee;
+    
     try {
       const response = await axios.get(
         `http://localhost:5000/api/projects/${projectId}/tasks`,
-        { withCredentials: true }
+        { params, withCredentials: true }
       );
       setTasks(response.data);
     } catch (error) {
@@ -614,22 +619,16 @@ function App() {
     }
   };
 
-  // 筛选和搜索任务
-  const getFilteredTasks = () => {
-    return tasks.filter(task => {
-      // 搜索筛选
-      const matchesSearch = task.title.toLowerCase().includes(taskSearchTerm.toLowerCase()) ||
-                           task.description.toLowerCase().includes(taskSearchTerm.toLowerCase());
-      
-      // 优先级筛选
-      const matchesPriority = taskFilterPriority === 'all' || task.priority === taskFilterPriority;
-      
-      // 分配者筛选
-      const matchesAssignee = taskFilterAssignee === 'all' || task.assignee_id === parseInt(taskFilterAssignee);
-      
-      return matchesSearch && matchesPriority && matchesAssignee;
-    });
-  };
+  // 筛选和搜索条件变化时重新向后端请求任务列表（搜索输入防抖 300ms）
+  useEffect(() => {
+    if (!activeProjectId) return;
+    const timer = setTimeout(() => fetchTasks(activeProjectId), 300);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [taskSearchTerm, taskFilterPriority, taskFilterAssignee]);
+
+  // 任务列表已由后端按搜索和筛选条件过滤
+  const getFilteredTasks = () => tasks;
 
   // 加载状态渲染
   if (loading) {
@@ -3,21 +3,38 @@
  * 使用纯 CSS 和 HTML 实现简单数据可视化
  */
 
-import React from 'react';
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
 
 const SimpleChartDashboard = ({ tasks = [], projects = [], activeProjectId }) => {
-  // 计算统计数据
-  const taskStatusStats = tasks.reduce((acc, task) => {
+  // 选中项目时由后端 /stats 接口统计（GROUP BY），不必拉取全部任务
+  const [serverStats, setServerStats] = useState(null);
+
+  useEffect(() => {
+    if (!activeProjectId) {
+      setServerStats(null);
+      return;
+    }
+    axios.get(`http://localhost:5000/api/projects/${activeProjectId}/stats`, { withCredentials: true })
+      .then(response => setServerStats(response.data))
+      .catch(error => {
+        console.error('获取项目统计失败:', error);
+        setServerStats(null);
+      });
+  }, [activeProjectId, tasks]);
+
+  // 计算统计数据（接口不可用时退回本地统计）
+  const taskStatusStats = serverStats ? serverStats.by_status : tasks.reduce((acc, task) => {
     acc[task.status] = (acc[task.status] || 0) + 1;
     return acc;
   }, {});
 
-  const taskPriorityStats = tasks.reduce((acc, task) => {
+  const taskPriorityStats = serverStats ? serverStats.by_priority : tasks.reduce((acc, task) => {
     acc[task.priority] = (acc[task.priority] || 0) + 1;
     return acc;
   }, {});
 
-  const totalTasks = tasks.length;
+  const totalTasks = serverStats ? serverStats.total : tasks.length;
   const completedTasks = taskStatusStats.done || 0;
   const completionRate = totalTasks ? Math.round((completedTasks / totalTasks) * 100) : 0;
 